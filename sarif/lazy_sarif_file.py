@@ -0,0 +1,212 @@
+"""
+Defines a variant of `SarifFile` that indexes the results in a SARIF file and parses them on
+demand, for processing very large SARIF files.
+"""
+
+import json
+import mmap
+import os
+import re
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from sarif.sarif_file import SarifFile, SarifRun, _json_loads
+
+# Matches the tokens of JSON text that matter for locating runs and results: strings (group 1
+# is the string content, group 2 is set if the string is an object key) and brackets.
+_JSON_STRUCTURE_REGEX = re.compile(rb'"([^"\\]*(?:\\.[^"\\]*)*)"(\s*:)?|[{}\[\]]')
+
+_CLOSING_BRACKET_OF = {b"{": b"}", b"[": b"]"}
+
+
+def _json_structure_error(message, buffer, offset) -> json.JSONDecodeError:
+    # Only decode the text up to the error, to report its line and column.
+    doc = buffer[:offset].decode("utf-8", "replace")
+    return json.JSONDecodeError(message, doc, len(doc))
+
+
+def _sarif_container_kind(keys) -> Optional[str]:
+    """
+    Given the keys under which the enclosing JSON containers were opened, return which part of
+    a SARIF file the innermost container is: "runs", "run", "results" or "result", or None.
+    """
+    depth = len(keys)
+    if depth < 2 or keys[1] != b"runs":
+        return None
+    if depth == 2:
+        return "runs"
+    if depth == 3:
+        return "run"
+    if keys[3] == b"results":
+        return {4: "results", 5: "result"}.get(depth)
+    return None
+
+
+def _index_sarif_runs(buffer) -> Tuple[Tuple[int, int], List[Tuple]]:
+    """
+    Scan the JSON text of a SARIF file without parsing it, to find the byte offsets of its runs
+    and of the results in each run.
+    Returns a pair: the (start, end) offsets of the top-level "runs" array, and a list with a
+    tuple (run_start, run_end, results_start, results_end, result_spans) for each run, where
+    result_spans is a list of (start, end) offsets of the result objects.
+    The offsets are None if there is no "runs" array, or if a run has no "results" array.
+    Raises `json.JSONDecodeError` if the brackets in the text do not balance.
+    """
+    runs_span = (None, None)
+    runs = []
+    results_span = (None, None)
+    result_spans = []
+    # The key under which each enclosing container was opened (None for array elements).
+    keys = []
+    # The opening bracket and start offset of each enclosing container.
+    openings = []
+    pending_key = None
+    for match in _JSON_STRUCTURE_REGEX.finditer(buffer):
+        token = match.group(0)
+        if match.group(2):
+            pending_key = match.group(1)
+            continue
+        if token in _CLOSING_BRACKET_OF:
+            keys.append(pending_key)
+            openings.append((token, match.start()))
+        elif token in (b"}", b"]"):
+            if not openings or _CLOSING_BRACKET_OF[openings[-1][0]] != token:
+                raise _json_structure_error(
+                    "Unbalanced brackets", buffer, match.start()
+                )
+            span = (openings.pop()[1], match.end())
+            kind = _sarif_container_kind(keys)
+            keys.pop()
+            if kind == "runs":
+                runs_span = span
+            elif kind == "run":
+                runs.append(span + results_span + (result_spans,))
+                results_span = (None, None)
+                result_spans = []
+            elif kind == "results":
+                results_span = span
+            elif kind == "result":
+                result_spans.append(span)
+        pending_key = None
+    if openings:
+        raise _json_structure_error("Unterminated container", buffer, len(buffer))
+    return (runs_span, runs)
+
+
+def _load_sarif_skeleton(buffer) -> Tuple[Dict, List[Tuple[Dict, List]]]:
+    """
+    Index the runs and results in the JSON text of a SARIF file, and parse everything else.
+    Returns a pair: the file's JSON data with an empty "runs" list, and a list with a pair
+    (run_data, result_spans) for each run, where run_data has an empty "results" list.
+    """
+    ((runs_start, runs_end), run_index) = _index_sarif_runs(buffer)
+    if runs_start is None:
+        data = _json_loads(buffer[:])
+    else:
+        data = _json_loads(buffer[:runs_start] + b"[]" + buffer[runs_end:])
+    runs = []
+    for (run_start, run_end, results_start, results_end, result_spans) in run_index:
+        if results_start is None:
+            run_data = _json_loads(buffer[run_start:run_end])
+        else:
+            run_data = _json_loads(
+                buffer[run_start:results_start] + b"[]" + buffer[results_end:run_end]
+            )
+        runs.append((run_data, result_spans))
+    return (data, runs)
+
+
+class LazySarifRun(SarifRun):
+    """
+    A SarifRun whose results are not held in memory, but parsed on demand from the memory-mapped
+    SARIF file each time they are iterated.  See `LazySarifFile`.
+    """
+
+    __slots__ = ("_buffer", "_result_spans")
+
+    def __init__(self, sarif_file_object, run_index, run_data, buffer, result_spans):
+        super().__init__(sarif_file_object, run_index, run_data)
+        self._buffer = buffer
+        self._result_spans = result_spans
+
+    def _iter_unfiltered_results(self) -> Iterator[Dict]:
+        buffer = self._buffer
+        for (start, end) in self._result_spans:
+            yield _json_loads(buffer[start:end])
+
+    def get_results(self) -> List[Dict]:
+        """
+        Get the results from this run.  These are the Result objects as defined in the SARIF
+        standard section 3.27.  The results are filtered if a filter has ben configured.
+        The results are parsed from the file on every call.
+        https://docs.oasis-open.org/sarif/sarif/v2.1.0/os/sarif-v2.1.0-os.html#_Toc34317638
+        """
+        return list(self.iter_results())
+
+    def iter_results(self) -> Iterator[Dict]:
+        """
+        Iterate the results from this run, parsing each one from the file as it is reached.
+        The results are filtered if a filter has ben configured.
+        """
+        return iter(self._filter.filter_results(self._iter_unfiltered_results()))
+
+    def get_result_count(self) -> int:
+        """
+        Return the total number of results.  Unless a filter has been configured, this is
+        answered from the index without parsing any results.
+        """
+        if self._filter.is_active():
+            return super().get_result_count()
+        return len(self._result_spans)
+
+
+class LazySarifFile(SarifFile):
+    """
+    A SarifFile that memory-maps the file and indexes the byte offsets of its results, instead
+    of parsing the whole file up front.  Results are parsed on demand when they are iterated, so
+    iterating them does not need every result in memory at once.  However, `get_records()` and
+    the counts and histograms derived from it cache a few fields of every result, so memory use
+    still grows with the number of results once they are used.
+    Results are parsed afresh each time they are read, so changes made to result objects are not
+    retained; use `SarifFile` for operations that modify results, such as `blame`.
+    The `data` attribute holds the file's JSON data with the results left out.
+    Call `close()`, or use as a context manager, to release the memory map.
+    """
+
+    __slots__ = ("_buffer",)
+
+    def __init__(self, file_path):
+        with open(file_path, "rb") as file_in:
+            if os.fstat(file_in.fileno()).st_size == 0:
+                # mmap cannot map an empty file; report it as the json module would.
+                raise json.JSONDecodeError("Expecting value", "", 0)
+            self._buffer = mmap.mmap(file_in.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (data, runs) = _load_sarif_skeleton(self._buffer)
+            super().__init__(file_path, data)
+            self.runs = [
+                LazySarifRun(self, run_index, run_data, self._buffer, result_spans)
+                for (run_index, (run_data, result_spans)) in enumerate(runs)
+            ]
+            data["runs"] = [run.run_data for run in self.runs]
+        except Exception:
+            self.close()
+            raise
+
+    @classmethod
+    def from_path(cls, file_path):
+        """
+        Index a SARIF file and return as a LazySarifFile object.
+        """
+        return cls(file_path)
+
+    def close(self):
+        """
+        Release the memory map of the file.  Results cannot be read after this.
+        """
+        self._buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
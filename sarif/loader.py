@@ -3,7 +3,6 @@ Code to load SARIF files from disk.
 """
 
 import glob
-import json
 import os
 
 from sarif.sarif_file import has_sarif_file_extension, SarifFile, SarifFileSet
@@ -53,8 +52,6 @@ def load_sarif_file(file_path: str) -> SarifFile:
     data SHALL be encoded in utf-8.
     """
     try:
-        with open(file_path, encoding="utf-8") as file_in:
-            data = json.load(file_in)
-        return SarifFile(file_path, data)
+        return SarifFile.from_path(file_path)
     except Exception as exception:
         raise IOError(f"Cannot load {file_path}") from exception
@@ -27,7 +27,7 @@ def generate_trend_csv(input_files: SarifFileSet, output_file: str, dateformat:
     for input_file in input_files:
         input_file_name = input_file.get_file_name()
         print("Processing", input_file_name)
-        error_list = input_file.get_records()
+        result_count_by_severity = input_file.get_result_count_by_severity()
         tool_name = "/".join(input_file.get_distinct_tool_names())
         # Date parsing
         parsed_date = input_file.get_filename_timestamp()
@@ -35,13 +35,12 @@ def generate_trend_csv(input_files: SarifFileSet, output_file: str, dateformat:
             raise ValueError(f"Unable to parse date from filename: {input_file_name}")
 
         # Turn the date into something that looks nice in excel (d/m/y UK date format)
-        dstr = parsed_date[0]
         (year, month, day, hour, minute) = (
-            dstr[0:4],
-            dstr[4:6],
-            dstr[6:8],
-            dstr[9:11],
-            dstr[11:13],
+            parsed_date[0:4],
+            parsed_date[4:6],
+            parsed_date[6:8],
+            parsed_date[9:11],
+            parsed_date[11:13],
         )
         if dateformat == "ymd":
             excel_date = f"{year}-{month}-{day} {hour}:{minute}"
@@ -52,7 +51,7 @@ def generate_trend_csv(input_files: SarifFileSet, output_file: str, dateformat:
 
         # Store data
         error_storage.append(
-            _store_errors(parsed_date, excel_date, tool_name, error_list)
+            _store_errors(parsed_date, excel_date, tool_name, result_count_by_severity)
         )
 
     error_storage.sort(key=lambda record: record["_timestamp"])
@@ -73,14 +72,15 @@ def _write_csv(output_file: str, error_storage: List[Dict]) -> None:
             writer.writerow(key)
 
 
-def _store_errors(timestamp, excel_date, tool: str, list_of_errors: List[Dict]) -> Dict:
+def _store_errors(
+    timestamp, excel_date, tool: str, result_count_by_severity: Dict[str, int]
+) -> Dict:
     results = {
         "_timestamp": timestamp,  # not written to CSV, but used for sorting
         "Date": excel_date,
         "Tool": tool,
     }
     for severity in sarif_file.SARIF_SEVERITIES:
-        error_count = sum(1 for e in list_of_errors if severity in e["Severity"])
-        results[severity] = error_count
+        results[severity] = result_count_by_severity.get(severity, 0)
 
     return results
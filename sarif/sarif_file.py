@@ -5,21 +5,45 @@ files, along with associated functions and constants.
 
 import copy
 import datetime
+import itertools
+import json
 import os
 import re
+import sys
+from collections import Counter
 from typing import Dict, Iterator, List, Optional, Tuple
 
+from sarif.blame_filter import FilterStats, BlameFilter
+
+# Previously defined in this module, so still importable from here.
+# pylint: disable-next=unused-import
+from sarif.blame_filter import load_filter_stats_from_json_camel_case
+from sarif.sarif_file_utils import read_result_location
+
+try:
+    # orjson parses large SARIF files several times faster than the json module, so use it
+    # if it happens to be installed.
+    import orjson
+except ImportError:
+    orjson = None
+
 SARIF_SEVERITIES = ["error", "warning", "note"]
 
+# Shared string objects for the standard severities, so that record severities compare quickly.
+_SEVERITY_CONSTANTS = {severity: severity for severity in SARIF_SEVERITIES}
+
 RECORD_ATTRIBUTES = ["Tool", "Severity", "Code", "Location", "Line"]
 
 # Standard time format for filenames, e.g. `20211012T110000Z` (not part of the SARIF standard).
 # Can obtain from bash via `date +"%Y%m%dT%H%M%SZ"``
 DATETIME_FORMAT = "%Y%m%dT%H%M%SZ"
 DATETIME_REGEX = r"\d{8}T\d{6}Z"
+_DATETIME_COMPILED_REGEX = re.compile(DATETIME_REGEX)
 
 _SLASHES = ["\\", "/"]
 
+_SARIF_FILE_EXTENSIONS = (".sarif", ".sarif.json")
+
 
 def has_sarif_file_extension(filename):
     """
@@ -27,52 +51,30 @@ def has_sarif_file_extension(filename):
     ".sarif.json".
     https://docs.oasis-open.org/sarif/sarif/v2.1.0/os/sarif-v2.1.0-os.html#_Toc34317421
     """
-    filename_upper = filename.upper().strip()
-    return any(filename_upper.endswith(x) for x in [".SARIF", ".SARIF.JSON"])
-
-
-def _read_result_location(result) -> Tuple[str, str]:
-    """
-    Extract the file path and line number strings from the Result.
-    Tools store this in different ways, so this function tries a few different JSON locations.
-    """
-    file_path = None
-    line_number = None
-    locations = result.get("locations", [])
-    if locations:
-        location = locations[0]
-        physical_location = location.get("physicalLocation", {})
-        # SpotBugs has some errors with no line number so deal with them by just leaving it at 1
-        line_number = physical_location.get("region", {}).get("startLine", None)
-        # For file name, first try the location written by DevSkim
-        file_path = (
-            location.get("physicalLocation", {})
-            .get("address", {})
-            .get("fullyQualifiedName", None)
-        )
-        if not file_path:
-            # Next try the physical location written by MobSF and by SpotBugs (for some errors)
-            file_path = (
-                location.get("physicalLocation", {})
-                .get("artifactLocation", {})
-                .get("uri", None)
-            )
-        if not file_path:
-            logical_locations = location.get("logicalLocations", None)
-            if logical_locations:
-                # Finally, try the logical location written by SpotBugs for some errors
-                file_path = logical_locations[0].get("fullyQualifiedName", None)
-    return (file_path, line_number)
+    return filename.strip().lower().endswith(_SARIF_FILE_EXTENSIONS)
 
 
 def _group_records_by_severity(records) -> Dict[str, List[Dict]]:
     """
     Get the records, grouped by severity.
     """
-    return {
-        severity: [record for record in records if record["Severity"] == severity]
-        for severity in SARIF_SEVERITIES
-    }
+    ret = {severity: [] for severity in SARIF_SEVERITIES}
+    for record in records:
+        severity_records = ret.get(record["Severity"])
+        if severity_records is not None:
+            severity_records.append(record)
+    return ret
+
+
+def _json_loads(json_bytes):
+    if orjson:
+        try:
+            return orjson.loads(json_bytes)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than the json module, e.g. it rejects NaN and integers wider
+            # than 64 bits, so fall back to json rather than fail to load such files.
+            pass
+    return json.loads(json_bytes)
 
 
 def _count_records_by_issue_code(records, severity) -> List[Tuple]:
@@ -80,118 +82,20 @@ def _count_records_by_issue_code(records, severity) -> List[Tuple]:
     Return a list of pairs (code, count) of the records with the specified
     severities.
     """
-    code_to_count = {}
-    for record in records:
-        if record["Severity"] == severity:
-            code = record["Code"]
-            code_to_count[code] = code_to_count.get(code, 0) + 1
-    return sorted(code_to_count.items(), key=lambda x: x[1], reverse=True)
-
-
-class FilterStats:
-    """
-    Statistics that record the outcome of a a filter.
-    """
-
-    def __init__(self, filter_description):
-        self.filter_description = filter_description
-        # Filter stats can also be loaded from a file created by `sarif copy`.
-        self.rehydrated = False
-        self.filter_datetime = None
-        self.filtered_in_result_count = 0
-        self.filtered_out_result_count = 0
-        self.missing_blame_count = 0
-        self.unconvincing_line_number_count = 0
-
-    def reset_counters(self):
-        """
-        Zero all the counters.
-        """
-        self.filter_datetime = datetime.datetime.now()
-        self.filtered_in_result_count = 0
-        self.filtered_out_result_count = 0
-        self.missing_blame_count = 0
-        self.unconvincing_line_number_count = 0
-
-    def add(self, other_filter_stats):
-        """
-        Add another set of filter stats to my totals.
-        """
-        if other_filter_stats:
-            if other_filter_stats.filter_description and (
-                other_filter_stats.filter_description != self.filter_description
-            ):
-                self.filter_description += f", {other_filter_stats.filter_description}"
-            self.filtered_in_result_count += other_filter_stats.filtered_in_result_count
-            self.filtered_out_result_count += (
-                other_filter_stats.filtered_out_result_count
-            )
-            self.missing_blame_count += other_filter_stats.missing_blame_count
-            self.unconvincing_line_number_count += (
-                other_filter_stats.unconvincing_line_number_count
-            )
-
-    def __str__(self):
-        """
-        Automatic to_string()
-        """
-        return self.to_string()
-
-    def to_string(self):
-        """
-        Generate a summary string for these filter stats.
-        """
-        ret = f"'{self.filter_description}'"
-        if self.filter_datetime:
-            ret += " at "
-            ret += self.filter_datetime.strftime("%c")
-        ret += (
-            f": {self.filtered_out_result_count} filtered out, "
-            f"{self.filtered_in_result_count} passed the filter"
-        )
-        if self.unconvincing_line_number_count:
-            ret += (
-                f", {self.unconvincing_line_number_count} included by default "
-                "for lacking line number information"
-            )
-        if self.missing_blame_count:
-            ret += (
-                f", {self.missing_blame_count} included by default "
-                "for lacking blame data to filter"
-            )
-        return ret
-
-    def to_json_camel_case(self):
-        """
-        Generate filter stats as JSON using camelCase naming, to fit with SARIF standard section
-        3.8.1 (Property Bags).
-        """
-        return {
-            "filter": self.filter_description,
-            "in": self.filtered_in_result_count,
-            "out": self.filtered_out_result_count,
-            "default": {
-                "noLineNumber": self.unconvincing_line_number_count,
-                "noBlame": self.missing_blame_count,
-            },
-        }
+    code_to_count = Counter(
+        record["Code"] for record in records if record["Severity"] == severity
+    )
+    return code_to_count.most_common()
 
 
-def load_filter_stats_from_json_camel_case(json_data):
+def _merge_issue_code_histograms(histograms) -> List[Tuple]:
     """
-    Load filter stats from a SARIF file property bag
+    Combine lists of pairs (code, count) into a single list, summing the counts for each code.
     """
-    ret = None
-    if json_data:
-        ret = FilterStats(json_data["filter"])
-        ret.rehydrated = True
-        ret.filtered_in_result_count = json_data.get("in", 0)
-        ret.filtered_out_result_count = json_data.get("out", 0)
-        ret.unconvincing_line_number_count = json_data.get("default", {}).get(
-            "noLineNumber", 0
-        )
-        ret.missing_blame_count = json_data.get("default", {}).get("noBlame", 0)
-    return ret
+    code_to_count = Counter()
+    for histogram in histograms:
+        code_to_count.update(dict(histogram))
+    return code_to_count.most_common()
 
 
 def _add_filter_stats(accumulator, filter_stats):
@@ -203,166 +107,6 @@ def _add_filter_stats(accumulator, filter_stats):
     return accumulator
 
 
-class _BlameFilter:
-    """
-    Class that implements blame filtering.
-    """
-
-    def __init__(self):
-        self.filter_stats = None
-        self.include_substrings = None
-        self.include_regexes = None
-        self.apply_inclusion_filter = False
-        self.exclude_substrings = None
-        self.exclude_regexes = None
-        self.apply_exclusion_filter = False
-
-    def init_blame_filter(
-        self,
-        filter_description,
-        include_substrings,
-        include_regexes,
-        exclude_substrings,
-        exclude_regexes,
-    ):
-        """
-        Initialise the blame filter with the given filter patterns.
-        """
-        self.filter_stats = FilterStats(filter_description)
-        self.include_substrings = (
-            [s.upper().strip() for s in include_substrings]
-            if include_substrings
-            else None
-        )
-        self.include_regexes = include_regexes[:] if include_regexes else None
-        self.apply_inclusion_filter = bool(
-            self.include_substrings or self.include_regexes
-        )
-        self.exclude_substrings = (
-            [s.upper().strip() for s in exclude_substrings]
-            if exclude_substrings
-            else None
-        )
-        self.exclude_regexes = exclude_regexes[:] if exclude_regexes else None
-        self.apply_exclusion_filter = bool(
-            self.exclude_substrings or self.exclude_regexes
-        )
-
-    def rehydrate_filter_stats(self, dehydrated_filter_stats, filter_datetime):
-        """
-        Restore filter stats from the SARIF file directly, where they were recordd when the filter
-        was previously run.
-
-        Note that if init_blame_filter is called, these rehydrated stats are discarded.
-        """
-        self.filter_stats = load_filter_stats_from_json_camel_case(
-            dehydrated_filter_stats
-        )
-        self.filter_stats.filter_datetime = filter_datetime
-
-    def _zero_counts(self):
-        if self.filter_stats:
-            self.filter_stats.reset_counters()
-
-    def _check_include_result(self, author_mail):
-        author_mail_upper = author_mail.upper().strip()
-        matched_include_substrings = None
-        matched_include_regexes = None
-        if self.apply_inclusion_filter:
-            if self.include_substrings:
-                matched_include_substrings = [
-                    s for s in self.include_substrings if s in author_mail_upper
-                ]
-            if self.include_regexes:
-                matched_include_regexes = [
-                    r
-                    for r in self.include_regexes
-                    if re.search(r, author_mail, re.IGNORECASE)
-                ]
-            if (not matched_include_substrings) and (not matched_include_regexes):
-                return False
-        if self.exclude_substrings and any(
-            s in author_mail_upper for s in self.exclude_substrings
-        ):
-            return False
-        if self.exclude_regexes and any(
-            re.search(r, author_mail, re.IGNORECASE) for r in self.exclude_regexes
-        ):
-            return False
-        return {
-            "state": "included",
-            "matchedSubstring": [s.lower() for s in matched_include_substrings]
-            if matched_include_substrings
-            else [],
-            "matchedRegex": [r.lower() for r in matched_include_regexes]
-            if matched_include_regexes
-            else [],
-        }
-
-    def _filter_append(self, filtered_results, result, blame_info):
-        # Remove any existing filter log on the result
-        result.setdefault("properties", {}).pop("filtered", None)
-        if blame_info:
-            author_mail = blame_info.get("author-mail", None) or blame_info.get(
-                "committer-mail", None
-            )
-            if author_mail:
-                # First, check inclusion
-                included = self._check_include_result(author_mail)
-                if included:
-                    self.filter_stats.filtered_in_result_count += 1
-                    included["filter"] = self.filter_stats.filter_description
-                    result["properties"]["filtered"] = included
-                    filtered_results.append(result)
-                else:
-                    (_file_path, line_number) = _read_result_location(result)
-                    if line_number == "1" or not line_number:
-                        # Line number is not convincing.  Blame information may be misattributed.
-                        self.filter_stats.unconvincing_line_number_count += 1
-                        result["properties"]["filtered"] = {
-                            "filter": self.filter_stats.filter_description,
-                            "state": "default",
-                            "missing": "line",
-                        }
-                        filtered_results.append(result)
-                    else:
-                        self.filter_stats.filtered_out_result_count += 1
-            else:
-                self.filter_stats.missing_blame_count += 1
-                # Result did not contain complete blame information, so don't filter it out.
-                result["properties"]["filtered"] = {
-                    "filter": self.filter_stats.filter_description,
-                    "state": "default",
-                    "missing": "blame",
-                }
-                filtered_results.append(result)
-        else:
-            self.filter_stats.missing_blame_count += 1
-            # Result did not contain blame information, so don't filter it out.
-            filtered_results.append(result)
-
-    def filter_results(self, results):
-        """
-        Apply this blame filter to a list of results, return the results that pass the filter
-        and as a side-effect, update the filter stats.
-        """
-        if self.apply_inclusion_filter or self.apply_exclusion_filter:
-            self._zero_counts()
-            ret = []
-            for result in results:
-                blame_info = result.get("properties", {}).get("blame", None)
-                self._filter_append(ret, result, blame_info)
-            return ret
-        # No inclusion or exclusion patterns
-        return results
-
-    def get_filter_stats(self) -> Optional[FilterStats]:
-        """
-        Get the statistics from running this filter.
-        """
-        return self.filter_stats
-
-
 class SarifRun:
     """
     Class to hold a run object from a SARIF file (an entry in the top-level "runs" list
@@ -370,13 +114,26 @@ class SarifRun:
     https://docs.oasis-open.org/sarif/sarif/v2.1.0/os/sarif-v2.1.0-os.html#_Toc34317484
     """
 
+    # Slots rather than a per-instance __dict__, as there can be very many runs.
+    __slots__ = (
+        "sarif_file",
+        "run_index",
+        "run_data",
+        "_path_prefixes_upper",
+        "_cache",
+        "_filter",
+        "_default_line_number",
+    )
+
     def __init__(self, sarif_file_object, run_index, run_data):
         self.sarif_file = sarif_file_object
         self.run_index = run_index
         self.run_data = run_data
         self._path_prefixes_upper = None
-        self._cached_records = None
-        self._filter = _BlameFilter()
+        # Data derived from the results, keyed by kind: "projection", "records", "grouped",
+        # "sev_counts", or ("histogram", severity).
+        self._cache = {}
+        self._filter = BlameFilter()
         self._default_line_number = None
         conversion = run_data.get("conversion", None)
         if conversion:
@@ -411,28 +168,38 @@ class SarifRun:
             records = self.get_records()
             if len(records) == 1:
                 loc = records[0]["Location"].strip()
-                slash_pos = max(loc.rfind(slash) for slash in _SLASHES)
-                autotrim_prefix = loc[0:slash_pos] if slash_pos > -1 else None
+                # Trim up to the last path separator of either kind.
+                (head, sep, tail) = loc.rpartition("/")
+                (tail_head, backslash, _) = tail.rpartition("\\")
+                if backslash:
+                    (head, sep) = (head + sep + tail_head, backslash)
+                autotrim_prefix = head.upper() if sep else None
             elif len(records) > 1:
-                common_prefix = records[0]["Location"].strip()
-                for record in records[1:]:
-                    for (char_pos, char) in enumerate(record["Location"].strip()):
-                        if char_pos >= len(common_prefix):
-                            break
-                        if char != common_prefix[char_pos]:
-                            common_prefix = common_prefix[0:char_pos]
-                            break
-                    if not common_prefix:
-                        break
+                # Character-wise common prefix, not necessarily ending at a path separator.
+                common_prefix = os.path.commonprefix(
+                    [record["Location"].strip() for record in records]
+                )
                 if common_prefix:
                     autotrim_prefix = common_prefix.upper()
             if autotrim_prefix and not any(
                 p.startswith(autotrim_prefix.strip().upper()) for p in prefixes
             ):
                 prefixes.append(autotrim_prefix)
-        self._path_prefixes_upper = prefixes or None
+        # Longest prefixes first, so that the most specific matching prefix is stripped.
+        prefixes.sort(key=len, reverse=True)
+        self._path_prefixes_upper = tuple(prefixes) or None
         # Clear the untrimmed records cached by get_records() above.
-        self._cached_records = None
+        self._clear_cache()
+
+    def _clear_cache(self):
+        """
+        Discard the cached records and everything derived from them.  The projection of the
+        results is kept, as it does not depend on the path prefix stripping.
+        """
+        projection = self._cache.get("projection")
+        self._cache.clear()
+        if projection is not None:
+            self._cache["projection"] = projection
 
     def init_default_line_number_1(self):
         """
@@ -441,7 +208,7 @@ class SarifRun:
         None is returned.
         """
         self._default_line_number = "1"
-        self._cached_records = None
+        self._clear_cache()
 
     def init_blame_filter(
         self,
@@ -473,8 +240,8 @@ class SarifRun:
             exclude_substrings,
             exclude_regexes,
         )
-        # Clear the unfiltered records cached by get_records() above.
-        self._cached_records = None
+        # Clear the unfiltered results projected and cached by get_records() above.
+        self._cache.clear()
 
     def get_tool_name(self) -> str:
         """
@@ -500,21 +267,99 @@ class SarifRun:
         """
         return self._filter.filter_results(self.run_data["results"])
 
+    def iter_results(self) -> Iterator[Dict]:
+        """
+        Iterate the results from this run, as per `get_results()`.
+        """
+        return iter(self.get_results())
+
+    def _project(self) -> Tuple[List, List, List, List, List]:
+        """
+        Walk the results of this run once, extracting the fields needed for records into
+        parallel lists: (rule IDs, file paths, line numbers, severities, messages).
+        The file paths are not yet prefix-stripped, so the projection survives changes to the
+        path prefix stripping.
+        """
+        projection = self._cache.get("projection")
+        if projection is None:
+            rule_ids = []
+            file_paths = []
+            line_numbers = []
+            severities = []
+            messages = []
+            for result in self.iter_results():
+                error_id = result["ruleId"]
+                (file_path, line_number) = read_result_location(result)
+                if not file_path:
+                    raise ValueError(
+                        f"No location in {error_id} output from {self.get_tool_name()}"
+                    )
+                rule_ids.append(error_id)
+                file_paths.append(file_path)
+                line_numbers.append(line_number)
+                # If an error has no specified level then by default it is a warning.
+                # Shared constants, as there are only a few distinct values, compared many times.
+                level = result.get("level", "warning")
+                severities.append(_SEVERITY_CONSTANTS.get(level, level))
+                messages.append(result["message"]["text"])
+            projection = (rule_ids, file_paths, line_numbers, severities, messages)
+            self._cache["projection"] = projection
+        return projection
+
+    def _strip_path_prefix(self, file_path):
+        if self._path_prefixes_upper:
+            file_path_upper = file_path.upper()
+            if not file_path_upper.startswith(self._path_prefixes_upper):
+                return file_path
+            for prefix in self._path_prefixes_upper:
+                if file_path_upper.startswith(prefix):
+                    prefixlen = len(prefix)
+                    if len(file_path) > prefixlen and file_path[prefixlen] in _SLASHES:
+                        # Strip off trailing path separator
+                        return file_path[prefixlen + 1 :]
+                    return file_path[prefixlen:]
+        return file_path
+
     def get_records(self) -> List[Dict]:
         """
         Get simplified records derived from the results of this run.  The records have the
         keys defined in `RECORD_ATTRIBUTES`.
         """
-        if not self._cached_records:
-            results = self.get_results()
-            self._cached_records = [self.result_to_record(result) for result in results]
-        return self._cached_records
+        records = self._cache.get("records")
+        if records is None:
+            (rule_ids, file_paths, line_numbers, severities, messages) = self._project()
+            if self._path_prefixes_upper:
+                file_paths = [self._strip_path_prefix(path) for path in file_paths]
+            tool_name = sys.intern(self.get_tool_name())
+            records = [
+                {
+                    "Tool": tool_name,
+                    "Location": file_path,
+                    "Line": line_number or "1",
+                    "Severity": severity,
+                    "Code": f"{error_id} {message}",
+                }
+                for (error_id, file_path, line_number, severity, message) in zip(
+                    rule_ids, file_paths, line_numbers, severities, messages
+                )
+            ]
+            self._cache["records"] = records
+        return records
 
     def get_records_grouped_by_severity(self) -> Dict[str, List[Dict]]:
         """
         Get the records, grouped by severity.
         """
-        return _group_records_by_severity(self.get_records())
+        grouped = self._cache.get("grouped")
+        if grouped is None:
+            grouped = _group_records_by_severity(self.get_records())
+            self._cache["grouped"] = grouped
+            # The counts come for free from the same pass.
+            self._cache.setdefault(
+                "sev_counts",
+                {severity: len(records) for (severity, records) in grouped.items()},
+            )
+        return grouped
 
     def result_to_record(self, result):
         """
@@ -524,40 +369,20 @@ class SarifRun:
         https://docs.oasis-open.org/sarif/sarif/v2.1.0/os/sarif-v2.1.0-os.html#_Toc34317638
         """
         error_id = result["ruleId"]
-        tool_name = self.get_tool_name()
-        (file_path, line_number) = _read_result_location(result)
+        (file_path, line_number) = read_result_location(result)
         if not file_path:
-            raise ValueError(f"No location in {error_id} output from {tool_name}")
-        if not line_number:
-            line_number = "1"
-
-        if self._path_prefixes_upper:
-            file_path_upper = file_path.upper()
-            for prefix in self._path_prefixes_upper:
-                if file_path_upper.startswith(prefix):
-                    prefixlen = len(prefix)
-                    if len(file_path) > prefixlen and file_path[prefixlen] in _SLASHES:
-                        # Strip off trailing path separator
-                        file_path = file_path[prefixlen + 1 :]
-                    else:
-                        file_path = file_path[prefixlen:]
-                    break
-
-        # Get the error severity, if included, and code
-        severity = result.get(
-            "level", "warning"
-        )  # If an error has no specified level then by default it is a warning
+            raise ValueError(
+                f"No location in {error_id} output from {self.get_tool_name()}"
+            )
         message = result["message"]["text"]
-
-        # Create a dict representing this result
-        record = {
-            "Tool": tool_name,
-            "Location": file_path,
-            "Line": line_number,
-            "Severity": severity,
+        return {
+            "Tool": sys.intern(self.get_tool_name()),
+            "Location": self._strip_path_prefix(file_path),
+            "Line": line_number or "1",
+            # If an error has no specified level then by default it is a warning.
+            "Severity": result.get("level", "warning"),
             "Code": f"{error_id} {message}",
         }
-        return record
 
     def get_result_count(self) -> int:
         """
@@ -569,18 +394,33 @@ class SarifRun:
         """
         Return a dict from SARIF severity to number of records.
         """
-        records = self.get_records()
-        return {
-            severity: sum(1 for record in records if severity in record["Severity"])
-            for severity in SARIF_SEVERITIES
-        }
+        sev_counts = self._cache.get("sev_counts")
+        if sev_counts is None:
+            # Count straight from the projected severities, without building the records.
+            (_, _, _, severities, _) = self._project()
+            severity_counts = Counter(severities)
+            sev_counts = {
+                severity: severity_counts[severity] for severity in SARIF_SEVERITIES
+            }
+            self._cache["sev_counts"] = sev_counts
+        return sev_counts
 
     def get_issue_code_histogram(self, severity) -> List[Tuple]:
         """
         Return a list of pairs (code, count) of the records with the specified
         severities.
         """
-        return _count_records_by_issue_code(self.get_records(), severity)
+        histogram = self._cache.get(("histogram", severity))
+        if histogram is None:
+            if severity in SARIF_SEVERITIES:
+                # Only scan the records of this severity, already bucketed by the cached grouping.
+                records = self.get_records_grouped_by_severity()[severity]
+            else:
+                # The grouping has no bucket for other levels, such as "none".
+                records = self.get_records()
+            histogram = _count_records_by_issue_code(records, severity)
+            self._cache[("histogram", severity)] = histogram
+        return histogram
 
     def get_filter_stats(self) -> Optional[FilterStats]:
         """
@@ -594,6 +434,8 @@ class SarifFile:
     Class to hold SARIF data parsed from a file and provide accesssors to the data.
     """
 
+    __slots__ = ("abs_file_path", "data", "runs", "_tool_names")
+
     def __init__(self, file_path, data):
         self.abs_file_path = os.path.abspath(file_path)
         self.data = data
@@ -601,6 +443,22 @@ class SarifFile:
             SarifRun(self, run_index, run_data)
             for (run_index, run_data) in enumerate(self.data.get("runs", []))
         ]
+        self._tool_names = None
+
+    @classmethod
+    def from_path(cls, file_path):
+        """
+        Load JSON data from a file and return as a SarifFile object.
+        As per https://tools.ietf.org/id/draft-ietf-json-rfc4627bis-09.html#rfc.section.8.1, JSON
+        data SHALL be encoded in utf-8.
+        """
+        if orjson:
+            with open(file_path, "rb") as file_in:
+                data = _json_loads(file_in.read())
+        else:
+            with open(file_path, encoding="utf-8") as file_in:
+                data = json.load(file_in)
+        return cls(file_path, data)
 
     def __bool__(self):
         """
@@ -672,34 +530,46 @@ class SarifFile:
         """
         return os.path.basename(self.abs_file_path)
 
+    def _split_file_name(self) -> Tuple[str, str]:
+        """
+        Split the file name into name and extension, treating ".sarif.json" as one extension.
+        """
+        (name, extension) = os.path.splitext(self.get_file_name())
+        if extension.lower() == ".json":
+            (inner_name, inner_extension) = os.path.splitext(name)
+            if inner_extension.lower() == ".sarif":
+                return (inner_name, inner_extension + extension)
+        return (name, extension)
+
     def get_file_name_without_extension(self) -> str:
         """
         Get the file name from which this SARIF data was loaded, without extension.
         """
-        file_name = self.get_file_name()
-        return file_name[0 : file_name.index(".")] if "." in file_name else file_name
+        return self._split_file_name()[0]
 
     def get_file_name_extension(self) -> str:
         """
         Get the extension of the file name from which this SARIF data was loaded.
         Initial "." exlcuded.
         """
-        file_name = self.get_file_name()
-        return file_name[file_name.index(".") + 1 :] if "." in file_name else ""
+        return self._split_file_name()[1][1:]
 
-    def get_filename_timestamp(self) -> str:
+    def get_filename_timestamp(self) -> Optional[str]:
         """
-        Extract the timestamp from the filename and return the date-time string extracted.
+        Extract the timestamp from the filename and return the date-time string extracted, or
+        None if the filename does not contain a timestamp.
         """
-        parsed_date = re.findall(DATETIME_REGEX, self.get_file_name())
-        return parsed_date if len(parsed_date) == 1 else None
+        match = _DATETIME_COMPILED_REGEX.search(self.get_file_name())
+        return match.group(0) if match else None
 
     def get_distinct_tool_names(self):
         """
         Return a list of tool names that feature in the runs in this file.
         The list is deduplicated and sorted into alphabetical order.
         """
-        return sorted(list(set(run.get_tool_name() for run in self.runs)))
+        if self._tool_names is None:
+            self._tool_names = {run.get_tool_name() for run in self.runs}
+        return sorted(self._tool_names)
 
     def get_results(self) -> List[Dict]:
         """
@@ -707,20 +577,22 @@ class SarifFile:
         SARIF standard section 3.27.
         https://docs.oasis-open.org/sarif/sarif/v2.1.0/os/sarif-v2.1.0-os.html#_Toc34317638
         """
-        ret = []
-        for run in self.runs:
-            ret += run.get_results()
-        return ret
+        return list(self.iter_results())
+
+    def iter_results(self) -> Iterator[Dict]:
+        """
+        Iterate the results from all runs in this file, as per `get_results()`.
+        """
+        return itertools.chain.from_iterable(run.iter_results() for run in self.runs)
 
     def get_records(self) -> List[Dict]:
         """
         Get simplified records derived from the results of all runs.  The records have the
         keys defined in `RECORD_ATTRIBUTES`.
         """
-        ret = []
-        for run in self.runs:
-            ret += run.get_records()
-        return ret
+        return list(
+            itertools.chain.from_iterable(run.get_records() for run in self.runs)
+        )
 
     def get_records_grouped_by_severity(self) -> Dict[str, List[Dict]]:
         """
@@ -753,7 +625,9 @@ class SarifFile:
         Return a list of pairs (code, count) of the records with the specified
         severities.
         """
-        return _count_records_by_issue_code(self.get_records(), severity)
+        return _merge_issue_code_histograms(
+            run.get_issue_code_histogram(severity) for run in self.runs
+        )
 
     def get_filter_stats(self) -> Optional[FilterStats]:
         """
@@ -771,6 +645,8 @@ class SarifFileSet:
     The "composite" pattern is used to allow multiple subdirectories.
     """
 
+    __slots__ = ("subdirs", "files")
+
     def __init__(self):
         self.subdirs = []
         self.files = []
@@ -791,22 +667,19 @@ class SarifFileSet:
 
     def __iter__(self) -> Iterator[SarifFile]:
         """
-        Iterate the SARIF files in this set.
+        Iterate the SARIF files in this set, including those in nested subdirectories.
         """
         for subdir in self.subdirs:
-            for input_file in subdir.files:
-                yield input_file
-        for input_file in self.files:
-            yield input_file
+            yield from subdir
+        yield from self.files
 
     def __getitem__(self, index) -> SarifFile:
-        i = 0
-        for subdir in self.subdirs:
-            for input_file in subdir.files:
-                if i == index:
-                    return input_file
-                i += 1
-        return self.files[index - i]
+        """
+        Get the SARIF file at the given position in the iteration order.
+        """
+        # Not cached, as the public files and subdirs lists, including those of nested
+        # subdirectories, can be changed in place.
+        return list(self)[index]
 
     def get_description(self):
         """
@@ -899,13 +772,13 @@ class SarifFileSet:
         Return a list of tool names that feature in the runs in these files.
         The list is deduplicated and sorted into alphabetical order.
         """
-        all_tool_names = set()
-        for subdir in self.subdirs:
-            all_tool_names.update(subdir.get_distinct_tool_names())
-        for input_file in self.files:
-            all_tool_names.update(input_file.get_distinct_tool_names())
-
-        return sorted(list(all_tool_names))
+        all_tool_names = set().union(
+            *(
+                child.get_distinct_tool_names()
+                for child in itertools.chain(self.subdirs, self.files)
+            )
+        )
+        return sorted(all_tool_names)
 
     def get_results(self) -> List[Dict]:
         """
@@ -913,24 +786,27 @@ class SarifFileSet:
         SARIF standard section 3.27.
         https://docs.oasis-open.org/sarif/sarif/v2.1.0/os/sarif-v2.1.0-os.html#_Toc34317638
         """
-        ret = []
-        for subdir in self.subdirs:
-            ret += subdir.get_results()
-        for input_file in self.files:
-            ret += input_file.get_results()
-        return ret
+        return list(self.iter_results())
+
+    def iter_results(self) -> Iterator[Dict]:
+        """
+        Iterate the results from all runs in all files, as per `get_results()`.
+        """
+        return itertools.chain.from_iterable(
+            child.iter_results() for child in itertools.chain(self.subdirs, self.files)
+        )
 
     def get_records(self) -> List[Dict]:
         """
         Get simplified records derived from the results of all runs.  The records have the
         keys defined in `RECORD_ATTRIBUTES`.
         """
-        ret = []
-        for subdir in self.subdirs:
-            ret += subdir.get_records()
-        for input_file in self.files:
-            ret += input_file.get_records()
-        return ret
+        return list(
+            itertools.chain.from_iterable(
+                child.get_records()
+                for child in itertools.chain(self.subdirs, self.files)
+            )
+        )
 
     def get_records_grouped_by_severity(self) -> Dict[str, List[Dict]]:
         """
@@ -965,7 +841,10 @@ class SarifFileSet:
         Return a list of pairs (code, count) of the records with the specified
         severities.
         """
-        return _count_records_by_issue_code(self.get_records(), severity)
+        return _merge_issue_code_histograms(
+            child.get_issue_code_histogram(severity)
+            for child in itertools.chain(self.subdirs, self.files)
+        )
 
     def get_filter_stats(self) -> Optional[FilterStats]:
         """
@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from sarif import lazy_sarif_file
+
+
+def _result_texts(text):
+    buffer = text.encode("utf-8")
+    (_runs_span, runs) = lazy_sarif_file._index_sarif_runs(buffer)
+    return [
+        [buffer[start:end].decode("utf-8") for (start, end) in run[4]] for run in runs
+    ]
+
+
+def _write_sarif(tmp_path, text):
+    path = tmp_path / "test.sarif"
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+def test_index_ignores_brackets_and_escaped_quotes_in_strings():
+    result = r'{"ruleId": "A", "message": {"text": "x[{\"}]\\"}}'
+    text = '{"runs": [{"tool": {"driver": {"name": "t]}"}}, "results": [%s]}]}' % result
+    assert _result_texts(text) == [[result]]
+    assert json.loads(_result_texts(text)[0][0])["message"]["text"] == 'x[{"}]\\'
+
+
+def test_index_results_before_tool():
+    text = '{"runs": [{"results": [{"ruleId": "A"}, {"ruleId": "B"}], "tool": {}}]}'
+    assert _result_texts(text) == [['{"ruleId": "A"}', '{"ruleId": "B"}']]
+
+
+def test_index_ignores_nested_results_keys():
+    text = (
+        '{"runs": [{"tool": {}, '
+        '"properties": {"results": [{"ruleId": "X"}]}, '
+        '"invocations": [{"results": [{"ruleId": "Y"}]}], '
+        '"results": [{"ruleId": "A", "properties": {"results": [{"ruleId": "Z"}]}}]}]}'
+    )
+    texts = _result_texts(text)
+    assert len(texts) == 1
+    assert [json.loads(result)["ruleId"] for result in texts[0]] == ["A"]
+
+
+def test_index_runs_without_results():
+    text = '{"runs": [{"tool": {}}, {"tool": {}, "results": []}]}'
+    (_runs_span, runs) = lazy_sarif_file._index_sarif_runs(text.encode("utf-8"))
+    results_start = text.index("[]")
+    assert [run[2:] for run in runs] == [
+        (None, None, []),
+        (results_start, results_start + 2, []),
+    ]
+
+
+def test_lazy_sarif_file_reads_results(tmp_path):
+    data = {
+        "version": "2.1.0",
+        "runs": [
+            {"tool": {"driver": {"name": "empty"}}},
+            {
+                "tool": {"driver": {"name": "tool"}},
+                "results": [
+                    {
+                        "ruleId": "A",
+                        "level": "error",
+                        "message": {"text": "message"},
+                        "locations": [
+                            {"physicalLocation": {"artifactLocation": {"uri": "a.c"}}}
+                        ],
+                    }
+                ],
+            },
+        ],
+    }
+    with lazy_sarif_file.LazySarifFile(
+        _write_sarif(tmp_path, json.dumps(data))
+    ) as input_file:
+        assert input_file.get_result_count() == 1
+        assert input_file.get_results() == data["runs"][1]["results"]
+        assert input_file.get_issue_code_histogram("error") == [("A message", 1)]
+
+
+@pytest.mark.parametrize(
+    "text", ["", '{"runs": [{"results": []}]}]}', '{"runs": [{"results": [']
+)
+def test_lazy_sarif_file_malformed(tmp_path, text):
+    with pytest.raises(json.JSONDecodeError):
+        lazy_sarif_file.LazySarifFile(_write_sarif(tmp_path, text))
+
+
+def test_lazy_sarif_file_closes_map_when_not_sarif(tmp_path, monkeypatch):
+    buffers = []
+    original_mmap = lazy_sarif_file.mmap.mmap
+
+    def recording_mmap(*args, **kwargs):
+        buffers.append(original_mmap(*args, **kwargs))
+        return buffers[-1]
+
+    monkeypatch.setattr(lazy_sarif_file.mmap, "mmap", recording_mmap)
+    with pytest.raises(AttributeError):
+        lazy_sarif_file.LazySarifFile(_write_sarif(tmp_path, "[1, 2]"))
+    assert buffers and buffers[0].closed
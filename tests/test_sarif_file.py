@@ -0,0 +1,127 @@
+import pytest
+
+from sarif import sarif_file
+
+
+def _result(rule_id, level=None):
+    result = {
+        "ruleId": rule_id,
+        "message": {"text": "message"},
+        "locations": [
+            {
+                "physicalLocation": {
+                    "artifactLocation": {"uri": "src/file.c"},
+                    "region": {"startLine": 10},
+                }
+            }
+        ],
+    }
+    if level is not None:
+        result["level"] = level
+    return result
+
+
+def _result_at(location):
+    result = _result("A")
+    result["locations"][0]["physicalLocation"]["artifactLocation"]["uri"] = location
+    return result
+
+
+def _sarif_data(results):
+    return {
+        "version": "2.1.0",
+        "runs": [{"tool": {"driver": {"name": "tool"}}, "results": results}],
+    }
+
+
+def test_issue_code_histogram_for_level_none():
+    results = [_result("A", "none"), _result("A", "none"), _result("B", "error")]
+    input_file = sarif_file.SarifFile("test.sarif", _sarif_data(results))
+    assert input_file.get_issue_code_histogram("none") == [("A message", 2)]
+    assert input_file.get_issue_code_histogram("error") == [("B message", 1)]
+
+
+def test_from_path_accepts_json_that_orjson_rejects(tmp_path):
+    path = tmp_path / "test.sarif"
+    path.write_text(
+        '{"version": "2.1.0", "runs": [], "properties": '
+        '{"ratio": NaN, "big": 123456789012345678901234567890}}'
+    )
+    input_file = sarif_file.SarifFile.from_path(str(path))
+    assert input_file.data["properties"]["big"] == 123456789012345678901234567890
+
+
+def test_file_set_getitem_sees_files_added_to_subdirs():
+    parent = sarif_file.SarifFileSet()
+    subdir = sarif_file.SarifFileSet()
+    parent.add_dir(subdir)
+    with pytest.raises(IndexError):
+        parent[0]
+    input_file = sarif_file.SarifFile("test.sarif", _sarif_data([_result("A")]))
+    subdir.add_file(input_file)
+    assert parent[0] is input_file
+
+
+def test_get_filename_timestamp():
+    input_file = sarif_file.SarifFile("tool_20211012T110000Z.sarif", _sarif_data([]))
+    assert input_file.get_filename_timestamp() == "20211012T110000Z"
+    input_file = sarif_file.SarifFile("tool.sarif", _sarif_data([]))
+    assert input_file.get_filename_timestamp() is None
+
+
+def test_records_with_null_level():
+    results = [_result("A", None), _result("B", "error")]
+    results[0]["level"] = None
+    input_file = sarif_file.SarifFile("test.sarif", _sarif_data(results))
+    assert [record["Severity"] for record in input_file.get_records()] == [
+        None,
+        "error",
+    ]
+
+
+@pytest.mark.parametrize(
+    "file_name, name_without_extension, extension",
+    [
+        ("my.report.sarif", "my.report", "sarif"),
+        ("x.sarif.json", "x", "sarif.json"),
+        ("x.SARIF.JSON", "x", "SARIF.JSON"),
+    ],
+)
+def test_file_name_split_at_extension(file_name, name_without_extension, extension):
+    input_file = sarif_file.SarifFile(file_name, _sarif_data([]))
+    assert input_file.get_file_name_without_extension() == name_without_extension
+    assert input_file.get_file_name_extension() == extension
+
+
+def test_file_set_getitem_sees_files_replaced_in_place():
+    file_set = sarif_file.SarifFileSet()
+    file_set.add_file(sarif_file.SarifFile("a.sarif", _sarif_data([_result("A")])))
+    assert file_set[0].get_file_name() == "a.sarif"
+    replacement = sarif_file.SarifFile("b.sarif", _sarif_data([_result("B")]))
+    file_set.files[0] = replacement
+    assert file_set[0] is replacement
+
+
+def test_path_prefix_stripping_strips_longest_matching_prefix():
+    results = [_result_at("/home/u/a/f3.c"), _result_at("/home/u/b/f4.c")]
+    input_file = sarif_file.SarifFile("test.sarif", _sarif_data(results))
+    input_file.init_path_prefix_stripping(autotrim=True, path_prefixes=["/home"])
+    records = input_file.get_records()
+    assert [record["Location"] for record in records] == ["a/f3.c", "b/f4.c"]
+
+
+def test_autotrim_common_prefix_shortened_by_later_location():
+    results = [_result_at("abc/x.c"), _result_at("abc")]
+    input_file = sarif_file.SarifFile("test.sarif", _sarif_data(results))
+    input_file.init_path_prefix_stripping(autotrim=True)
+    records = input_file.get_records()
+    assert [record["Location"] for record in records] == ["x.c", ""]
+
+
+@pytest.mark.parametrize(
+    "location", ["C:/Src/Proj\\dir0/f0.c", "C:\\Src/Proj/dir0\\f0.c", "Src/f0.c"]
+)
+def test_autotrim_single_record(location):
+    input_file = sarif_file.SarifFile("test.sarif", _sarif_data([_result_at(location)]))
+    input_file.init_path_prefix_stripping(autotrim=True)
+    assert input_file.get_records()[0]["Location"] == "f0.c"